@@ -5,20 +5,45 @@ Flask web app for Iris species prediction.
 
 Features
 --------
-- Loads trained model from artifacts/models/model.pkl
+- Loads trained model from artifacts/models/model.pkl (pre-warmed)
+- Serves from three static rules (artifacts/models/iris_rules.json) when exported
+- Otherwise compiles the fitted decision tree into plain nested if/else Python code
+- Caches predictions on the exact float32 inputs the model compares against
 - Validates numeric inputs against sensible Iris ranges
+- ``POST /predict`` JSON endpoint scoring a list of samples in one ``predict`` call
 - Shows helpful stats (Range, Mean, IQR) above inputs
 - Wider form container, full-width Predict button
 - Subtle background image overlay (~20% opacity)
+
+Running
+-------
+Production (pre-forked workers sharing the model loaded by the master)::
+
+    gunicorn -w $(nproc) -k gthread --threads 4 --preload -b 0.0.0.0:5000 app:app
+
+Local development (Werkzeug server with debugger/reloader)::
+
+    FLASK_DEV=1 python app.py
+
+Batch prediction::
+
+    curl -X POST localhost:5000/predict -H "Content-Type: application/json" \
+         -d '[{"SepalLengthCm": 5.1, "SepalWidthCm": 3.5, "PetalLengthCm": 1.4, "PetalWidthCm": 0.2}]'
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict
+import itertools
+import json
+import os
+from array import array
+from functools import lru_cache
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple
 
 import joblib
 import numpy as np
-from flask import Flask, render_template, request
+import sklearn
+from flask import Flask, jsonify, render_template, request
 
 # Optional integration with project logger / exceptions
 try:
@@ -42,10 +67,29 @@ except Exception:
 # -------------------------------------------------------------------
 app = Flask(__name__)
 
+# Reject oversized request bodies before they are parsed (1 MiB)
+app.config["MAX_CONTENT_LENGTH"] = 1024 * 1024
+
+# Inputs are range-checked before every predict, so skip sklearn's NaN/inf
+# scan. sklearn's config is thread-local: this covers import-time work, and
+# the request-time predict calls (/predict, the single-sample fallback) wrap
+# themselves in config_context.
+sklearn.set_config(assume_finite=True)
+
 MODEL_PATH = "artifacts/models/model.pkl"
+ENCODER_PATH = "artifacts/processed/label_encoder.pkl"
+RULES_PATH = "artifacts/models/iris_rules.json"
+
 model = joblib.load(MODEL_PATH)
 logger.info("Model loaded from %s", MODEL_PATH)
 
+# The model predicts int8 class codes; the encoder maps them back to species
+label_encoder = joblib.load(ENCODER_PATH)
+logger.info("Label encoder loaded from %s", ENCODER_PATH)
+
+# Warm-up: run one predict so the first real request doesn't pay first-call costs
+model.predict(np.zeros((1, 4), dtype=np.float32))
+
 
 # -------------------------------------------------------------------
 # UI Config (Iris stats from the canonical dataset)
@@ -81,44 +125,206 @@ IRIS_FEATURES: Dict[str, Dict[str, Any]] = {
 # Defaults (means make a sensible starting point)
 DEFAULTS = {k: v["mean"] for k, v in IRIS_FEATURES.items()}
 
+# Set PREDICT_CACHE_DEBUG=1 to log prediction-cache statistics per request
+CACHE_DEBUG = bool(os.environ.get("PREDICT_CACHE_DEBUG"))
+
+
+# Per-field validation table, built once: (key, min, max, label) in IRIS_FEATURES order
+VALIDATORS = tuple(
+    (name, conf["min"], conf["max"], conf["label"]) for name, conf in IRIS_FEATURES.items()
+)
+
+# Largest number of samples accepted by one /predict request
+MAX_PREDICT_BATCH = 1000
+
+# Vectorised bounds shared by form and /predict validation (IRIS_FEATURES order)
+MINS = np.array([conf["min"] for conf in IRIS_FEATURES.values()], dtype=np.float32)
+MAXS = np.array([conf["max"] for conf in IRIS_FEATURES.values()], dtype=np.float32)
+
 
-def _parse_and_validate(name: str, value: str) -> float:
+@lru_cache(maxsize=256)
+def _parse_float(value: str) -> float:
+    """Memoised ``float(value)``; repeated form strings (e.g. defaults) parse once."""
+    return float(value)
+
+
+def _parse_and_validate(form: Mapping[str, str]) -> Tuple[float, ...]:
     """
-    Convert posted value to float and validate it against configured min/max.
+    Convert posted values to floats and validate them against configured min/max.
 
     Parameters
     ----------
-    name : str
-        Feature key from IRIS_FEATURES.
-    value : str
-        Posted value to parse.
+    form : Mapping[str, str]
+        Posted form data keyed by IRIS_FEATURES names.
 
     Returns
     -------
-    float
-        Parsed and validated value.
+    Tuple[float, ...]
+        Parsed and validated values, in IRIS_FEATURES order.
 
     Raises
     ------
     CustomException
-        If parsing fails or value is out of range.
+        If parsing fails or a value is out of range.
     """
-    conf = IRIS_FEATURES[name]
+    parse = _parse_float
+    values = []
 
     # Convert to float
+    for name, _, _, label in VALIDATORS:
+        try:
+            values.append(parse(form.get(name, "")))
+        except Exception as e:
+            raise CustomException(f"{label}: value must be numeric.") from e
+
+    # Range validation in one vectorised check against the same float32
+    # bounds as /predict (disallows negatives via min, and NaN)
+    x = np.fromiter(values, dtype=np.float32, count=len(values))
+    bad = ~((x >= MINS) & (x <= MAXS))
+    if bad.any():
+        i = int(bad.argmax())
+        _, lo, hi, label = VALIDATORS[i]
+        raise CustomException(f"{label}: {values[i]} is out of range [{lo}, {hi}].")
+
+    return tuple(values)
+
+
+# -------------------------------------------------------------------
+# Compiled tree
+# The fitted tree is turned into straight-line ``if x[f] <= t`` Python
+# source once at import time, so single-sample inference is a handful
+# of float comparisons instead of a full ``model.predict`` round-trip.
+# -------------------------------------------------------------------
+def _compile_tree(clf: Any, class_names: Sequence[str]) -> Optional[Callable[[Sequence[float]], str]]:
+    """
+    Generate and compile a ``predict_one(x)`` function from a fitted tree.
+
+    Parameters
+    ----------
+    clf : Any
+        Fitted estimator; only single-output trees exposing ``tree_`` are supported.
+    class_names : Sequence[str]
+        Species names aligned with ``clf.classes_``.
+
+    Returns
+    -------
+    Callable or None
+        ``predict_one(x) -> str`` taking the four measurements (as float32
+        values, matching sklearn's internal dtype), or None if the model
+        cannot be compiled.
+    """
+    tree = getattr(clf, "tree_", None)
+    if tree is None or tree.n_outputs != 1:
+        return None
+
+    left, right = tree.children_left, tree.children_right
+    feature, threshold, value = tree.feature, tree.threshold, tree.value
+    lines = ["def predict_one(x):"]
+
+    def emit(node: int, depth: int) -> None:
+        indent = "    " * depth
+        if left[node] == right[node]:  # leaf
+            lines.append(f"{indent}return {str(class_names[int(np.argmax(value[node][0]))])!r}")
+            return
+        lines.append(f"{indent}if x[{int(feature[node])}] <= {float(threshold[node])!r}:")
+        emit(int(left[node]), depth + 1)
+        lines.append(f"{indent}else:")
+        emit(int(right[node]), depth + 1)
+
     try:
-        x = float(value)
-    except Exception as e:
-        raise CustomException(f"{conf['label']}: value must be numeric.") from e
+        emit(0, 1)
+        namespace: Dict[str, Any] = {}
+        exec(compile("\n".join(lines), "<compiled-tree>", "exec"), namespace)
+    except (RecursionError, SyntaxError, MemoryError) as e:
+        logger.warning("Could not compile decision tree, using model.predict: %s", e)
+        return None
+
+    return namespace["predict_one"]
+
+
+# -------------------------------------------------------------------
+# Static rules
+# When training exported the tree as three rules, inference is two float
+# comparisons. The joblib model is kept to validate the rules at startup
+# and as the fallback when they are missing or disagree with it.
+# -------------------------------------------------------------------
+def _load_rules(path: str) -> Optional[Callable[[Sequence[float]], str]]:
+    """
+    Build a predictor from ``iris_rules.json`` and check it against the model.
 
-    # Range validation (disallows negatives automatically via min)
-    if x < conf["min"] or x > conf["max"]:
-        raise CustomException(
-            f"{conf['label']}: {x} is out of range "
-            f"[{conf['min']}, {conf['max']}]."
-        )
+    The rules are evaluated on a grid over the configured feature ranges;
+    any disagreement with ``model.predict`` discards them.
 
-    return x
+    Parameters
+    ----------
+    path : str
+        Location of the exported rules JSON.
+
+    Returns
+    -------
+    Callable or None
+        ``predict_rules(x) -> str`` over the four measurements, or None if
+        the rules are unavailable or invalid.
+    """
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            rules = json.load(f)
+
+        rf, rt, rc = rules["root_feature"], rules["root_threshold"], rules["root_class"]
+        sf, st = rules["split_feature"], rules["split_threshold"]
+        lc, rc2 = rules["left_class"], rules["right_class"]
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("Ignoring unreadable rules file %s: %s", path, e)
+        return None
+
+    def predict_rules(x: Sequence[float]) -> str:
+        if x[rf] <= rt:
+            return rc
+        return lc if x[sf] <= st else rc2
+
+    # Validate against the full model before trusting the rules: sweep every
+    # step of the features the rules use, others at their min/mean/max
+    axes = [
+        np.arange(c["min"], c["max"] + c["step"] / 2, c["step"])
+        if i in (rf, sf)
+        else [c["min"], c["mean"], c["max"]]
+        for i, c in enumerate(IRIS_FEATURES.values())
+    ]
+    probes = np.array(list(itertools.product(*axes)), dtype=np.float32)
+    expected = label_encoder.inverse_transform(model.predict(probes))
+    if any(predict_rules(row.tolist()) != want for row, want in zip(probes, expected)):
+        logger.warning("Rules in %s disagree with the model; ignoring them.", path)
+        return None
+
+    return predict_rules
+
+
+predict_fn = _load_rules(RULES_PATH)
+if predict_fn is not None:
+    logger.info("Serving predictions from static rules in %s", RULES_PATH)
+else:
+    predict_fn = _compile_tree(model, label_encoder.inverse_transform(model.classes_))
+    if predict_fn is not None:
+        logger.info("Decision tree compiled to Python (%d nodes).", model.tree_.node_count)
+
+
+def _predict_one(features: Sequence[float]) -> Any:
+    """Predict one sample with the rules/compiled tree, falling back to ``model.predict``."""
+    if predict_fn is not None:
+        # array("f") rounds to float32 exactly as sklearn does before comparing
+        return predict_fn(array("f", features))
+    with sklearn.config_context(assume_finite=True):
+        pred = model.predict(np.array([features], dtype=np.float32))
+    return label_encoder.inverse_transform(pred)[0]
+
+
+@lru_cache(maxsize=4096)
+def _cached_predict(sl: float, sw: float, pl: float, pw: float) -> Any:
+    """Memoised prediction for one sample, keyed on its float32-rounded values."""
+    return _predict_one((sl, sw, pl, pw))
 
 
 # -------------------------------------------------------------------
@@ -134,21 +340,14 @@ def index():
 
     if request.method == "POST":
         try:
-            sl = _parse_and_validate("SepalLengthCm", request.form.get("SepalLengthCm", ""))
-            sw = _parse_and_validate("SepalWidthCm", request.form.get("SepalWidthCm", ""))
-            pl = _parse_and_validate("PetalLengthCm", request.form.get("PetalLengthCm", ""))
-            pw = _parse_and_validate("PetalWidthCm", request.form.get("PetalWidthCm", ""))
-
-            inputs = {
-                "SepalLengthCm": sl,
-                "SepalWidthCm": sw,
-                "PetalLengthCm": pl,
-                "PetalWidthCm": pw,
-            }
-
-            data = np.array([[sl, sw, pl, pw]])
-            prediction = model.predict(data)[0]
+            values = _parse_and_validate(request.form)
+            inputs = dict(zip(IRIS_FEATURES, values))
+
+            # Key on the float32 values the tree compares, so the cache never changes a result
+            prediction = _cached_predict(*array("f", values))
             logger.info("Prediction successful: %s", str(prediction))
+            if CACHE_DEBUG:
+                logger.info("Prediction cache: %s", _cached_predict.cache_info())
 
         except Exception as e:
             error = str(e)
@@ -163,8 +362,67 @@ def index():
     )
 
 
+@app.route("/predict", methods=["POST"])
+def predict():
+    """
+    Predict species for a JSON list of samples in a single model call.
+
+    Expects a list of at most MAX_PREDICT_BATCH objects keyed by the
+    IRIS_FEATURES names, each value a JSON number, and returns the list of
+    predicted species in the same order. Invalid payloads and out-of-range
+    rows are rejected with HTTP 400.
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, list):
+        return jsonify(error="Expected a JSON list of samples."), 400
+
+    if len(payload) > MAX_PREDICT_BATCH:
+        return jsonify(error=f"At most {MAX_PREDICT_BATCH} samples per request."), 400
+
+    if not payload:
+        return jsonify([])
+
+    # Require real JSON numbers (bool is an int subclass, strings would be coerced)
+    rows = []
+    for row in payload:
+        values = [row.get(name) for name in IRIS_FEATURES] if isinstance(row, dict) else []
+        if len(values) != len(IRIS_FEATURES) or not all(
+            isinstance(v, (int, float)) and not isinstance(v, bool) for v in values
+        ):
+            return jsonify(error=f"Each sample needs numeric {', '.join(IRIS_FEATURES)} values."), 400
+        rows.append(values)
+
+    try:
+        X = np.array(rows, dtype=np.float32)
+    except (OverflowError, ValueError):
+        # JSON integers are unbounded; ones past float range cannot be converted
+        return jsonify(error="Samples out of range."), 400
+
+    # Single vectorised bounds check (also rejects NaN)
+    valid = ((X >= MINS) & (X <= MAXS)).all(axis=1)
+    if not valid.all():
+        bad_rows = np.flatnonzero(~valid).tolist()
+        return jsonify(error=f"Samples out of range at indices {bad_rows}."), 400
+
+    try:
+        with sklearn.config_context(assume_finite=True):
+            predictions = label_encoder.inverse_transform(model.predict(X)).tolist()
+    except Exception as e:
+        logger.error("Batch prediction failed: %s", e)
+        return jsonify(error="Prediction failed."), 500
+
+    logger.info("Batch prediction successful: %d samples", len(predictions))
+    return jsonify(predictions)
+
+
 # -------------------------------------------------------------------
 # Entrypoint
 # -------------------------------------------------------------------
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
+    if os.environ.get("FLASK_DEV"):
+        app.run(host="0.0.0.0", port=5000, debug=True)
+    else:
+        logger.info(
+            "Dev server disabled; set FLASK_DEV=1 or serve with "
+            "'gunicorn -w $(nproc) -k gthread --threads 4 --preload app:app'."
+        )
\ No newline at end of file
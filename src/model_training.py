@@ -12,11 +12,12 @@ and confusion matrix visualisation to disk.
 
 Responsibilities
 ----------------
-1. Load processed feature and target datasets.
-2. Train a Decision Tree model with predefined hyperparameters.
+1. Load processed feature and target datasets (``splits.npz``).
+2. Train a bounded Decision Tree and prune it via cost-complexity pruning.
 3. Evaluate model performance (accuracy, precision, recall, F1-score).
 4. Generate and save a confusion matrix plot.
 5. Persist the trained model to ``artifacts/models/``.
+6. Export the tree as three static rules (``iris_rules.json``) when it is small enough.
 
 Example
 -------
@@ -30,12 +31,15 @@ from __future__ import annotations
 # -------------------------------------------------------------------
 # Standard & third-party imports
 # -------------------------------------------------------------------
+import json
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
+
 import joblib
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
+from sklearn.preprocessing import LabelEncoder
 from sklearn.tree import DecisionTreeClassifier
+from sklearn.model_selection import StratifiedKFold, cross_val_score
 from sklearn.metrics import (
     accuracy_score,
     precision_score,
@@ -71,6 +75,8 @@ class ModelTraining:
         Directory for saving the trained model and confusion matrix plot.
     model : DecisionTreeClassifier
         The classifier used for training and inference.
+    label_encoder : LabelEncoder | None
+        Encoder mapping int8 class codes back to species names (set by ``load_data``).
     """
 
     def __init__(self) -> None:
@@ -83,11 +89,14 @@ class ModelTraining:
         # Ensure the model directory exists
         os.makedirs(self.model_path, exist_ok=True)
 
-        # Initialise the model
+        # Initialise the model (bounded depth/leaf size keeps the tree small)
         self.model: DecisionTreeClassifier = DecisionTreeClassifier(
-            criterion="gini", max_depth=30, random_state=42
+            criterion="gini", max_depth=5, min_samples_leaf=2, ccp_alpha=1e-3, random_state=42
         )
 
+        # Populated by load_data when the processed encoder is available
+        self.label_encoder: LabelEncoder | None = None
+
         logger.info("ModelTraining initialised successfully.")
 
     # -------------------------------------------------------------------
@@ -97,9 +106,13 @@ class ModelTraining:
         """
         Load preprocessed training and test datasets.
 
+        Reads ``splits.npz`` when present and falls back to the legacy
+        per-split Joblib pickles otherwise. The fitted ``label_encoder.pkl``
+        is loaded into ``self.label_encoder`` when it exists.
+
         Returns
         -------
-        Tuple of pd.DataFrame and pd.Series
+        Tuple of np.ndarray
             (X_train, X_test, y_train, y_test)
 
         Raises
@@ -108,11 +121,26 @@ class ModelTraining:
             If any dataset fails to load.
         """
         try:
-            # Load datasets from the processed artifacts directory
-            X_train = joblib.load(os.path.join(self.processed_data_path, "X_train.pkl"))
-            X_test = joblib.load(os.path.join(self.processed_data_path, "X_test.pkl"))
-            y_train = joblib.load(os.path.join(self.processed_data_path, "y_train.pkl"))
-            y_test = joblib.load(os.path.join(self.processed_data_path, "y_test.pkl"))
+            splits_path = os.path.join(self.processed_data_path, "splits.npz")
+
+            if os.path.exists(splits_path):
+                # Load all four splits from the single archive
+                with np.load(splits_path) as splits:
+                    X_train = splits["X_train"]
+                    X_test = splits["X_test"]
+                    y_train = splits["y_train"]
+                    y_test = splits["y_test"]
+            else:
+                # Load datasets from the legacy per-split pickles
+                X_train = joblib.load(os.path.join(self.processed_data_path, "X_train.pkl"))
+                X_test = joblib.load(os.path.join(self.processed_data_path, "X_test.pkl"))
+                y_train = joblib.load(os.path.join(self.processed_data_path, "y_train.pkl"))
+                y_test = joblib.load(os.path.join(self.processed_data_path, "y_test.pkl"))
+
+            # Load the encoder used to turn species names into class codes
+            encoder_path = os.path.join(self.processed_data_path, "label_encoder.pkl")
+            if os.path.exists(encoder_path):
+                self.label_encoder = joblib.load(encoder_path)
 
             logger.info("Processed data loaded successfully.")
             return X_train, X_test, y_train, y_test
@@ -124,48 +152,199 @@ class ModelTraining:
     # -------------------------------------------------------------------
     # Method: train_model
     # -------------------------------------------------------------------
-    def train_model(self, X_train, y_train) -> None:
+    def train_model(self, X_train, y_train) -> Future:
         """
-        Fit the Decision Tree classifier on training data and save the model.
+        Fit the Decision Tree classifier on training data and start saving the model.
+
+        The model is written to disk on a background thread so the caller can
+        evaluate it in the meantime; wait on the returned future before relying
+        on ``model.pkl``.
 
         Parameters
         ----------
-        X_train : pd.DataFrame
-            Training features.
-        y_train : pd.Series
+        X_train : np.ndarray
+            Training features, as the C-contiguous float32 array written by
+            ``DataProcessing`` (sklearn validates it without copying).
+        y_train : np.ndarray
             Training target labels.
 
+        Returns
+        -------
+        concurrent.futures.Future
+            Completes once ``model.pkl`` has been written.
+
         Raises
         ------
         CustomException
-            If training or model saving fails.
+            If training fails or the save cannot be scheduled.
         """
         try:
             # Fit the model to training data
             self.model.fit(X_train, y_train)
 
-            # Persist the trained model
-            joblib.dump(self.model, os.path.join(self.model_path, "model.pkl"))
+            # Prune further if cross-validation says a simpler tree is as good
+            alpha = self.select_ccp_alpha(X_train, y_train)
+            if alpha > self.model.ccp_alpha:
+                self.model.set_params(ccp_alpha=alpha)
+                self.model.fit(X_train, y_train)
+
+            logger.info(
+                "Model trained successfully (ccp_alpha=%.4g, %d nodes, depth %d).",
+                self.model.ccp_alpha,
+                self.model.tree_.node_count,
+                self.model.get_depth(),
+            )
+
+            # Persist the trained model uncompressed (cheaper to load than a compressed pickle)
+            # on a background thread; shutdown(wait=False) lets the save finish
+            executor = ThreadPoolExecutor(max_workers=1)
+            save_future = executor.submit(
+                joblib.dump, self.model, os.path.join(self.model_path, "model.pkl"), compress=0
+            )
+            executor.shutdown(wait=False)
 
-            logger.info("Model trained and saved successfully.")
+            return save_future
 
         except Exception as e:
             logger.error("Error during model training: %s", e)
             raise CustomException("Failed to train model", e)
 
+    # -------------------------------------------------------------------
+    # Method: select_ccp_alpha
+    # -------------------------------------------------------------------
+    def select_ccp_alpha(self, X_train, y_train, cv: int = 5) -> float:
+        """
+        Pick the cost-complexity pruning strength with the best CV accuracy.
+
+        Every alpha on the model's pruning path is scored with stratified
+        k-fold cross-validation; the alpha with the best mean accuracy is
+        returned, preferring the larger (smaller tree) on ties so pruning
+        only removes nodes that add no accuracy.
+
+        Parameters
+        ----------
+        X_train : np.ndarray
+            Training features.
+        y_train : np.ndarray
+            Training target labels.
+        cv : int, default=5
+            Number of cross-validation folds.
+
+        Returns
+        -------
+        float
+            The selected ``ccp_alpha`` (the model's current value when the
+            pruning path offers no candidates).
+        """
+        path = self.model.cost_complexity_pruning_path(X_train, y_train)
+
+        # The last alpha prunes down to the root, so it is never a useful candidate
+        alphas = np.unique(path.ccp_alphas[:-1])
+
+        # Root-only path (e.g. a single-class training set): nothing to choose from
+        if alphas.size == 0:
+            return float(self.model.ccp_alpha)
+        folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=42)
+
+        means = np.array([
+            cross_val_score(
+                DecisionTreeClassifier(**{**self.model.get_params(), "ccp_alpha": alpha}),
+                X_train,
+                y_train,
+                cv=folds,
+            ).mean()
+            for alpha in alphas
+        ])
+
+        return float(alphas[means == means.max()].max())
+
+    # -------------------------------------------------------------------
+    # Method: export_rules
+    # -------------------------------------------------------------------
+    def export_rules(self) -> bool:
+        """
+        Export the fitted tree as static rules for app.py's hot path.
+
+        Only trees of the shape ``if x[f1] <= t1: c1 elif x[f2] <= t2: c2
+        else: c3`` (a root whose left child is a leaf and whose right child
+        splits into two leaves) can be expressed this way; for any other
+        shape a stale ``iris_rules.json`` is removed so app.py falls back to
+        the full model.
+
+        Returns
+        -------
+        bool
+            True if ``iris_rules.json`` was written.
+
+        Raises
+        ------
+        CustomException
+            If the rules cannot be written.
+        """
+        try:
+            rules_path = os.path.join(self.model_path, "iris_rules.json")
+            tree = self.model.tree_
+            left, right = tree.children_left, tree.children_right
+
+            def is_leaf(node: int) -> bool:
+                return left[node] == right[node]
+
+            root_leaf, split = int(left[0]), int(right[0])
+            if (
+                tree.node_count != 5
+                or not is_leaf(root_leaf)
+                or is_leaf(split)
+                or not (is_leaf(left[split]) and is_leaf(right[split]))
+            ):
+                if os.path.exists(rules_path):
+                    os.remove(rules_path)
+                logger.info("Tree has %d nodes; static rules not exported.", tree.node_count)
+                return False
+
+            # Map each leaf to its majority class, as species names when possible
+            class_names = self.model.classes_
+            if self.label_encoder is not None:
+                class_names = self.label_encoder.inverse_transform(class_names)
+
+            def leaf_class(node: int) -> str:
+                return str(class_names[int(np.argmax(tree.value[node][0]))])
+
+            rules = {
+                "root_feature": int(tree.feature[0]),
+                "root_threshold": float(tree.threshold[0]),
+                "root_class": leaf_class(root_leaf),
+                "split_feature": int(tree.feature[split]),
+                "split_threshold": float(tree.threshold[split]),
+                "left_class": leaf_class(int(left[split])),
+                "right_class": leaf_class(int(right[split])),
+            }
+
+            with open(rules_path, "w", encoding="utf-8") as f:
+                json.dump(rules, f, indent=2)
+
+            logger.info("Static rules exported to %s", rules_path)
+            return True
+
+        except Exception as e:
+            logger.error("Error while exporting rules: %s", e)
+            raise CustomException("Failed to export rules", e)
+
     # -------------------------------------------------------------------
     # Method: evaluate_model
     # -------------------------------------------------------------------
-    def evaluate_model(self, X_test, y_test) -> None:
+    def evaluate_model(self, X_test, y_test, plot: bool = True) -> None:
         """
         Evaluate the trained model on test data and generate a confusion matrix.
 
         Parameters
         ----------
-        X_test : pd.DataFrame
+        X_test : np.ndarray
             Test features.
-        y_test : pd.Series
+        y_test : np.ndarray
             True labels for the test set.
+        plot : bool, default=True
+            Whether to render and save the confusion matrix image. Matplotlib
+            is only imported when this is True.
 
         Raises
         ------
@@ -188,19 +367,37 @@ class ModelTraining:
             logger.info(f"Recall Score    : {recall:.4f}")
             logger.info(f"F1 Score        : {f1:.4f}")
 
-            # Compute confusion matrix
-            cm = confusion_matrix(y_test, y_pred)
+            # Metrics only; skip the (comparatively slow) plotting stack
+            if not plot:
+                return
+
+            # Compute confusion matrix in the model's own (sorted) class order
+            classes = self.model.classes_
+            cm = confusion_matrix(y_test, y_pred, labels=classes)
+
+            # Axis labels: species names when the class codes can be decoded
+            class_labels = classes
+            if self.label_encoder is not None:
+                class_labels = self.label_encoder.inverse_transform(class_labels)
+
+            # Import matplotlib lazily with a non-interactive backend
+            import matplotlib
+
+            matplotlib.use("Agg")
+            import matplotlib.pyplot as plt
 
             # Create the confusion matrix plot
             plt.figure(figsize=(8, 6))
-            sns.heatmap(
-                cm,
-                annot=True,
-                cmap="Blues",
-                fmt="d",
-                xticklabels=np.unique(y_test),
-                yticklabels=np.unique(y_test),
-            )
+            plt.imshow(cm, cmap="Blues")
+            plt.colorbar()
+            plt.xticks(range(len(class_labels)), class_labels)
+            plt.yticks(range(len(class_labels)), class_labels)
+
+            # Annotate each cell with its count (white text on dark cells)
+            threshold = cm.max() / 2
+            for (i, j), v in np.ndenumerate(cm):
+                plt.text(j, i, v, ha="center", va="center", color="white" if v > threshold else "black")
+
             plt.title("Confusion Matrix")
             plt.xlabel("Predicted Label")
             plt.ylabel("Actual Label")
@@ -226,18 +423,36 @@ class ModelTraining:
         Steps
         -----
         1. Load processed data.
-        2. Train the Decision Tree model.
-        3. Evaluate the model and save results.
+        2. Train the Decision Tree model (saving starts in the background).
+        3. Export static rules when the tree is small enough.
+        4. Evaluate the model and save results.
+        5. Wait for the model save to complete.
+
+        Raises
+        ------
+        CustomException
+            If the background model save fails.
         """
         # Load preprocessed training and test data
         X_train, X_test, y_train, y_test = self.load_data()
 
-        # Train the model on training data
-        self.train_model(X_train, y_train)
+        # Train the model on training data; the save overlaps with evaluation
+        save_future = self.train_model(X_train, y_train)
+
+        # Export the tree as static rules for app.py (when it has the 3-rule shape)
+        self.export_rules()
 
         # Evaluate the model and log metrics
         self.evaluate_model(X_test, y_test)
 
+        # Make sure the model is on disk before returning
+        try:
+            save_future.result()
+            logger.info("Model saved successfully.")
+        except Exception as e:
+            logger.error("Error while saving model: %s", e)
+            raise CustomException("Failed to save model", e)
+
 
 # -------------------------------------------------------------------
 # Script entrypoint